@@ -14,13 +14,22 @@ Dump metadata of a dataset
 __docformat__ = 'restructuredtext'
 
 
-import json
+import concurrent.futures
 import logging
+from collections import deque
+from itertools import (
+    chain,
+    islice,
+    repeat,
+)
 from pathlib import Path
 from typing import (
     cast,
-    Any,
+    Callable,
     Generator,
+    Iterable,
+    List,
+    Tuple,
     Union,
 )
 from uuid import UUID
@@ -38,6 +47,7 @@ from datalad.ui import ui
 from dataladmetadatamodel import JSONObject
 from dataladmetadatamodel.common import get_top_level_metadata_objects
 from dataladmetadatamodel.datasettree import datalad_root_record_name
+from dataladmetadatamodel.mappableobject import MappableObject
 from dataladmetadatamodel.mapper.reference import Reference
 from dataladmetadatamodel.metadata import (
     Metadata,
@@ -50,6 +60,7 @@ from dataladmetadatamodel.uuidset import UUIDSet
 from dataladmetadatamodel.versionlist import TreeVersionList
 
 from .exceptions import NoMetadataStoreFound
+from .utils import json_dumps
 from .pathutils.metadataurlparser import (
     MetadataURLParser,
     TreeMetadataURL,
@@ -64,47 +75,169 @@ default_mapper_family = "git"
 
 lgr = logging.getLogger('datalad.metadata.dump')
 
+# Number of threads that map metadata objects before they are reported,
+# and the limits of the number of objects that are mapped ahead.
+max_prefetch_workers = 4
+min_prefetch_window = max_prefetch_workers
+max_prefetch_window = 64
 
-def _dataset_report_matcher(node: Any) -> bool:
-    return isinstance(node, MetadataRootRecord)
+# Number of result records that are passed up in one batch
+result_batch_size = 64
 
+# Metadata paths are immutable, so the empty path can be shared
+_empty_metadata_path = MetadataPath("")
 
-def _file_report_matcher(node: Any) -> bool:
-    return isinstance(node, Metadata)
 
+def _is_remote_store(metadata_store: Union[Path, str]) -> bool:
+    return isinstance(metadata_store, str) \
+        and Reference.is_remote(metadata_store)
 
-def _create_result_record(mapper: str,
-                          metadata_store: Union[Path, str],
-                          metadata_record: JSONObject,
-                          element_path: MetadataPath,
-                          report_type: str):
+
+def _prefetch_mapped(objects: Iterable[MappableObject],
+                     concurrent_mapping: bool = True
+                     ) -> Generator[Tuple[MappableObject, bool], None, None]:
+    """
+    Map the given objects concurrently and yield them in their order.
+
+    If concurrent_mapping is False, each object is mapped when it is
+    yielded. That is required for remote metadata stores, because their
+    objects are fetched into a shared local cache repository, which
+    does not support concurrent fetches.
+
+    Objects are taken from objects only when they are about to be
+    mapped, i.e. objects may be generated lazily. Mapping is started
+    for a window of objects ahead of the yielded object. After each
+    window, its size is doubled, if more than half of the yielded
+    objects had to be waited for, and halved, if less than a quarter
+    of them had to be waited for.
+
+    Yields 2-tuples of an object and the result of its ensure_mapped()
+    call, i.e. whether the caller should purge the object.
+    """
+    if not concurrent_mapping:
+        for mappable_object in objects:
+            yield mappable_object, mappable_object.ensure_mapped()
+        return
+
+    object_iterator = iter(objects)
+    first_objects = list(islice(object_iterator, 2))
+    if not first_objects:
+        return
+
+    # There is nothing to overlap the mapping of a single object
+    # with, so do not start worker threads for it.
+    if len(first_objects) == 1:
+        yield first_objects[0], first_objects[0].ensure_mapped()
+        return
+
+    window = min_prefetch_window
+    waited = 0
+    consumed = 0
+    pending = deque()
+    object_iterator = chain(first_objects, object_iterator)
+
+    with concurrent.futures.ThreadPoolExecutor(max_prefetch_workers) \
+            as executor:
+
+        def submit(count: int):
+            for mappable_object in islice(object_iterator, count):
+                pending.append((
+                    mappable_object,
+                    executor.submit(mappable_object.ensure_mapped)))
+
+        try:
+            submit(window)
+            while pending:
+                mappable_object, future = pending.popleft()
+                if not future.done():
+                    waited += 1
+                needs_purge = future.result()
+
+                consumed += 1
+                if consumed == window:
+                    if waited > consumed / 2:
+                        window = min(2 * window, max_prefetch_window)
+                    elif waited < consumed / 4:
+                        window = max(window // 2, min_prefetch_window)
+                    waited = 0
+                    consumed = 0
+
+                submit(window - len(pending))
+                yield mappable_object, needs_purge
+        finally:
+            # Purge objects that were mapped ahead, but not yielded,
+            # e.g. because the consumer stopped early. A failed mapping
+            # must not replace the exception that might be propagating,
+            # and the object is not mapped, if its mapping failed.
+            for mappable_object, future in pending:
+                try:
+                    needs_purge = future.result()
+                except Exception as e:
+                    lgr.debug(
+                        "ignoring failed prefetch of %s: %s",
+                        mappable_object, e)
+                    continue
+                if needs_purge:
+                    mappable_object.purge()
+
+
+def _get_result_path_factory(metadata_store: Union[Path, str]
+                             ) -> Callable[[MetadataPath], Union[Path, str]]:
+    """
+    Get a function that determines the path in result records from the
+    path of an element in the metadata store. The kind of the store does
+    not change during a dump, so the function is only selected once.
+    """
 
     # Display remote metadata stores properly
-    if isinstance(metadata_store, str):
-        if Reference.is_remote(metadata_store):
-            path = metadata_store + ":/" + str(element_path)
-        else:
-            path = (Path(metadata_store) / element_path).absolute()
-    else:
-        path = (metadata_store / element_path).absolute()
+    if _is_remote_store(metadata_store):
+        def remote_result_path(element_path: MetadataPath) -> str:
+            return metadata_store + ":/" + str(element_path)
+        return remote_result_path
+
+    store_location = Path(metadata_store).absolute()
 
+    def local_result_path(element_path: MetadataPath) -> Path:
+        return store_location / element_path
+    return local_result_path
+
+
+def _get_result_template(mapper: str,
+                         metadata_store: Union[Path, str],
+                         report_type: str) -> dict:
+    """
+    Get the properties that all result records of a dump share. Result
+    records are created by copying the template, which is faster than
+    creating them from a dict display.
+    """
     return {
         "status": "ok",
         "action": "meta_dump",
         "backend": mapper,
         "metadata_source": metadata_store,
         "type": report_type,
-        "metadata": metadata_record,
-        "path": path,
+        "metadata": None,
+        "path": None,
     }
 
 
+def _create_result_record(result_template: dict,
+                          metadata_record: JSONObject,
+                          path: Union[Path, str]) -> dict:
+
+    result_record = result_template.copy()
+    result_record["metadata"] = metadata_record
+    result_record["path"] = path
+    return result_record
+
+
 def _get_common_properties(root_dataset_identifier: UUID,
                            root_dataset_version: str,
-                           metadata_root_record: MetadataRootRecord,
+                           dataset_identifier: str,
+                           dataset_version: str,
                            dataset_path: MetadataPath) -> dict:
 
-    if dataset_path != MetadataPath(""):
+    if dataset_path != _empty_metadata_path:
         root_info = {
             "root_dataset_id": str(root_dataset_identifier),
             "root_dataset_version": root_dataset_version,
@@ -114,22 +247,30 @@ def _get_common_properties(root_dataset_identifier: UUID,
 
     return {
         **root_info,
-        "dataset_id": str(metadata_root_record.dataset_identifier),
-        "dataset_version": metadata_root_record.dataset_version
+        "dataset_id": dataset_identifier,
+        "dataset_version": dataset_version
     }
 
 
-def _get_instance_properties(extractor_name: str,
-                             instance: MetadataInstance) -> dict:
-    return {
-        "extraction_time": instance.time_stamp,
-        "agent_name": instance.author_name,
-        "agent_email": instance.author_email,
-        "extractor_name": extractor_name,
-        "extractor_version": instance.configuration.version,
-        "extraction_parameter": instance.configuration.parameter,
-        "extracted_metadata": instance.metadata_content
-    }
+def _iter_instances(metadata: Metadata
+                    ) -> Iterable[Tuple[str, MetadataInstance]]:
+    """ Iterate over all extractor-name and metadata instance pairs """
+    return chain.from_iterable(
+        zip(repeat(extractor_name), extractor_runs)
+        for extractor_name, extractor_runs in metadata.extractor_runs())
+
+
+def _set_instance_properties(metadata_record: dict,
+                             extractor_name: str,
+                             instance: MetadataInstance):
+    configuration = instance.configuration
+    metadata_record["extraction_time"] = instance.time_stamp
+    metadata_record["agent_name"] = instance.author_name
+    metadata_record["agent_email"] = instance.author_email
+    metadata_record["extractor_name"] = extractor_name
+    metadata_record["extractor_version"] = configuration.version
+    metadata_record["extraction_parameter"] = configuration.parameter
+    metadata_record["extracted_metadata"] = instance.metadata_content
 
 
 def show_dataset_metadata(mapper: str,
@@ -140,6 +281,28 @@ def show_dataset_metadata(mapper: str,
                           metadata_root_record: MetadataRootRecord
                           ) -> Generator[dict, None, None]:
 
+    yield from show_all_metadata(
+        mapper,
+        metadata_store,
+        root_dataset_identifier,
+        root_dataset_version,
+        dataset_path,
+        metadata_root_record,
+        _empty_metadata_path,
+        False,
+        report_file_metadata=False)
+
+
+def _dataset_metadata_batches(mapper: str,
+                              metadata_store: Path,
+                              result_path: Callable[[MetadataPath],
+                                                    Union[Path, str]],
+                              root_dataset_identifier: UUID,
+                              root_dataset_version: str,
+                              dataset_path: MetadataPath,
+                              metadata_root_record: MetadataRootRecord
+                              ) -> Generator[List[dict], None, None]:
+
     purge_metadata_root_record = metadata_root_record.ensure_mapped()
     dataset_level_metadata = \
         metadata_root_record.dataset_level_metadata.read_in()
@@ -155,28 +318,38 @@ def show_dataset_metadata(mapper: str,
     common_properties = _get_common_properties(
         root_dataset_identifier,
         root_dataset_version,
-        metadata_root_record,
+        str(metadata_root_record.dataset_identifier),
+        metadata_root_record.dataset_version,
         dataset_path)
 
     assert isinstance(dataset_level_metadata, Metadata)
 
-    for extractor_name, extractor_runs in dataset_level_metadata.extractor_runs():
-        for instance in extractor_runs:
+    # All records of this dataset start with the same properties
+    record_template = {
+        "type": "dataset",
+        **common_properties
+    }
+
+    # The path is the same for all records of the dataset
+    dataset_result_path = result_path(dataset_path)
+    result_template = _get_result_template(mapper, metadata_store, "dataset")
+    batch = []
+    for extractor_name, instance in _iter_instances(dataset_level_metadata):
+
+        metadata_record = record_template.copy()
+        _set_instance_properties(metadata_record, extractor_name, instance)
 
-            instance_properties = _get_instance_properties(
-                extractor_name,
-                instance)
+        batch.append(_create_result_record(
+            result_template=result_template,
+            metadata_record=metadata_record,
+            path=dataset_result_path))
 
-            yield _create_result_record(
-                mapper=mapper,
-                metadata_store=metadata_store,
-                metadata_record={
-                    "type": "dataset",
-                    **common_properties,
-                    **instance_properties
-                },
-                element_path=dataset_path,
-                report_type="dataset")
+        if len(batch) == result_batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
 
     if purge_metadata_root_record:
         metadata_root_record.purge()
@@ -192,6 +365,30 @@ def show_file_tree_metadata(mapper: str,
                             recursive: bool
                             ) -> Generator[dict, None, None]:
 
+    yield from show_all_metadata(
+        mapper,
+        metadata_store,
+        root_dataset_identifier,
+        root_dataset_version,
+        dataset_path,
+        metadata_root_record,
+        search_pattern,
+        recursive,
+        report_dataset_metadata=False)
+
+
+def _file_tree_metadata_batches(mapper: str,
+                                metadata_store: Path,
+                                result_path: Callable[[MetadataPath],
+                                                      Union[Path, str]],
+                                root_dataset_identifier: UUID,
+                                root_dataset_version: str,
+                                dataset_path: MetadataPath,
+                                metadata_root_record: MetadataRootRecord,
+                                search_pattern: MetadataPath,
+                                recursive: bool
+                                ) -> Generator[List[dict], None, None]:
+
     purge_mrr = metadata_root_record.ensure_mapped()
 
     dataset_level_metadata = metadata_root_record.dataset_level_metadata
@@ -207,8 +404,10 @@ def show_file_tree_metadata(mapper: str,
     else:
         purge_file_tree = False
 
-    # Do not try to search anything if the file tree is empty
-    if not file_tree or not file_tree.mtree.child_nodes:
+    # Do not try to search anything if the file tree is empty. The child
+    # nodes of the mapped root node are a dict, checking them for
+    # emptiness does neither enumerate nor map any children.
+    if file_tree is None or not file_tree.mtree.child_nodes:
         if purge_file_tree:
             file_tree.purge()
         if purge_dataset_level_metadata:
@@ -217,54 +416,87 @@ def show_file_tree_metadata(mapper: str,
             metadata_root_record.purge()
         return
 
-    # Determine matching file paths
+    # Read the dataset properties only once, they are used in the
+    # record template and in the warning below.
+    dataset_identifier = str(metadata_root_record.dataset_identifier)
+    dataset_version = metadata_root_record.dataset_version
+
+    # All records of this file tree start with the same properties,
+    # "path" is set per file, but keeps its position in the record.
+    record_template = {
+        "type": "file",
+        "path": None,
+        **_get_common_properties(
+            root_dataset_identifier,
+            root_dataset_version,
+            dataset_identifier,
+            dataset_version,
+            dataset_path)
+    }
+
+    # Determine matching file paths, directory nodes are not reported.
+    # The paths of matches that were taken from the search, but not yet
+    # reported, are kept in the order of the matches.
     tree_search = MTreeSearch(file_tree.mtree)
+    matched_paths = deque()
+
+    def matched_metadata() -> Generator[Metadata, None, None]:
+        for path, metadata, _ in tree_search.search_pattern(
+                pattern=search_pattern,
+                recursive=recursive,
+                node_type=Metadata):
+            matched_paths.append(path)
+            yield metadata
+
+    # Map the matched metadata objects ahead of reporting them, while
+    # the search continues. If a recursive search purges a prefetched
+    # object together with its directory node, reading its extractor
+    # runs maps it again.
     result_count = 0
-    for path, metadata, _ in tree_search.search_pattern(pattern=search_pattern,
-                                                        recursive=recursive):
+    result_template = _get_result_template(mapper, metadata_store, "dataset")
+    batch = []
+    for metadata, purge_metadata in _prefetch_mapped(
+            matched_metadata(),
+            not _is_remote_store(metadata_store)):
+
+        path = matched_paths.popleft()
         result_count += 1
 
-        # Ignore empty datasets and ignore paths that do not
-        # described metadata, but a directory
-        if metadata is None or isinstance(metadata, MTreeNode):
-            continue
+        # The paths are the same for all records of the file
+        path_str = str(path)
+        file_result_path = result_path(dataset_path / path)
 
-        assert isinstance(metadata, Metadata)
+        for extractor_name, instance in _iter_instances(metadata):
 
-        common_properties = _get_common_properties(
-            root_dataset_identifier,
-            root_dataset_version,
-            metadata_root_record,
-            dataset_path)
+            metadata_record = record_template.copy()
+            metadata_record["path"] = path_str
+            _set_instance_properties(metadata_record, extractor_name, instance)
 
-        purge_metadata = metadata.ensure_mapped()
-        for extractor_name, extractor_runs in metadata.extractor_runs():
-            for instance in extractor_runs:
-
-                instance_properties = _get_instance_properties(
-                    extractor_name,
-                    instance)
-
-                yield _create_result_record(
-                    mapper=mapper,
-                    metadata_store=metadata_store,
-                    metadata_record={
-                        "type": "file",
-                        "path": str(path),
-                        **common_properties,
-                        **instance_properties
-                    },
-                    element_path=dataset_path / path,
-                    report_type="dataset")
+            batch.append(_create_result_record(
+                result_template=result_template,
+                metadata_record=metadata_record,
+                path=file_result_path))
 
         if purge_metadata:
             metadata.purge()
 
-    if result_count == 0:
+        if len(batch) >= result_batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+    # Directory nodes are not reported, but a non-recursive search for
+    # a directory, e.g. for the root directory, is not worth a warning.
+    # That is only checked if no metadata matched.
+    if result_count == 0 and (
+            recursive
+            or not _matches_directory(tree_search, search_pattern)):
         lgr.warning(
             f"pattern '{str(search_pattern)}' does not match any element "
-            f"in file-tree of dataset {metadata_root_record.dataset_identifier}"
-            f"@{metadata_root_record.dataset_version} (stored on "
+            f"in file-tree of dataset {dataset_identifier}"
+            f"@{dataset_version} (stored on "
             f"{mapper}:{metadata_store})")
 
     if purge_file_tree:
@@ -277,6 +509,97 @@ def show_file_tree_metadata(mapper: str,
         metadata_root_record.purge()
 
 
+def _matches_directory(tree_search: MTreeSearch,
+                       search_pattern: MetadataPath) -> bool:
+
+    # The search is exhausted, to let it purge all nodes it maps
+    directory_matches = tree_search.search_pattern(
+        pattern=search_pattern,
+        node_type=MTreeNode)
+    return sum(1 for _ in directory_matches) > 0
+
+
+def show_all_metadata(mapper: str,
+                      metadata_store: Path,
+                      root_dataset_identifier: UUID,
+                      root_dataset_version: str,
+                      dataset_path: MetadataPath,
+                      metadata_root_record: MetadataRootRecord,
+                      search_pattern: MetadataPath,
+                      recursive: bool,
+                      report_dataset_metadata: bool = True,
+                      report_file_metadata: bool = True
+                      ) -> Generator[dict, None, None]:
+    """
+    Yield the dataset-level records and the file-level records of a
+    dataset, whose file paths match search_pattern. Either kind of
+    records can be switched off, show_dataset_metadata and
+    show_file_tree_metadata report only one kind of records.
+    """
+
+    for batch in _all_metadata_batches(
+            mapper,
+            metadata_store,
+            _get_result_path_factory(metadata_store),
+            root_dataset_identifier,
+            root_dataset_version,
+            dataset_path,
+            metadata_root_record,
+            search_pattern,
+            recursive,
+            report_dataset_metadata,
+            report_file_metadata):
+        yield from batch
+
+
+def _all_metadata_batches(mapper: str,
+                          metadata_store: Path,
+                          result_path: Callable[[MetadataPath],
+                                                Union[Path, str]],
+                          root_dataset_identifier: UUID,
+                          root_dataset_version: str,
+                          dataset_path: MetadataPath,
+                          metadata_root_record: MetadataRootRecord,
+                          search_pattern: MetadataPath,
+                          recursive: bool,
+                          report_dataset_metadata: bool,
+                          report_file_metadata: bool
+                          ) -> Generator[List[dict], None, None]:
+    """
+    Yield batches of dataset-level records, if report_dataset_metadata
+    is True, and of file-level records, if report_file_metadata is True.
+    The metadata root record is mapped only once for both kinds of
+    records.
+    """
+
+    purge_mrr = metadata_root_record.ensure_mapped()
+
+    if report_dataset_metadata:
+        yield from _dataset_metadata_batches(
+            mapper,
+            metadata_store,
+            result_path,
+            root_dataset_identifier,
+            root_dataset_version,
+            dataset_path,
+            metadata_root_record)
+
+    if report_file_metadata:
+        yield from _file_tree_metadata_batches(
+            mapper,
+            metadata_store,
+            result_path,
+            root_dataset_identifier,
+            root_dataset_version,
+            dataset_path,
+            metadata_root_record,
+            search_pattern,
+            recursive)
+
+    if purge_mrr:
+        metadata_root_record.purge()
+
+
 def dump_from_dataset_tree(mapper: str,
                            metadata_store: Path,
                            tree_version_list: TreeVersionList,
@@ -286,12 +609,23 @@ def dump_from_dataset_tree(mapper: str,
 
     # Normalize path representation
     if not metadata_url or metadata_url.dataset_path is None:
-        metadata_url = TreeMetadataURL(MetadataPath(""), MetadataPath(""))
+        metadata_url = TreeMetadataURL(
+            _empty_metadata_path,
+            _empty_metadata_path)
+
+    result_path = _get_result_path_factory(metadata_store)
+
+    # A non-recursive search for the empty local path does only match the
+    # root directory of a file tree, which has no metadata, so skip it.
+    report_file_metadata = (
+        recursive or metadata_url.local_path != _empty_metadata_path)
 
     # Get specified version, if none is specified, take all versions.
+    # All versions are iterated lazily, in order to report the first
+    # records without collecting all versions first.
     requested_versions = ([metadata_url.version]
                           if metadata_url.version is not None
-                          else list(tree_version_list.versions()))
+                          else tree_version_list.versions())
 
     for version in requested_versions:
 
@@ -306,7 +640,7 @@ def dump_from_dataset_tree(mapper: str,
                 f"{mapper}:{metadata_store}")
             continue
 
-        root_mrr = dataset_tree.get_metadata_root_record(MetadataPath(""))
+        root_mrr = dataset_tree.get_metadata_root_record(_empty_metadata_path)
         if root_mrr is None:
             lgr.debug(
                 f"no root dataset record found for version "
@@ -320,7 +654,10 @@ def dump_from_dataset_tree(mapper: str,
             root_dataset_version = root_mrr.dataset_version
             root_dataset_identifier = root_mrr.dataset_identifier
 
-        # Create a tree search object to search for the specified datasets
+        # Create a tree search object to search for the specified datasets.
+        # Search objects are not cached across versions: every version has
+        # its own dataset tree, and creating a search object does not
+        # index the tree, it only keeps a reference to it.
         tree_search = MTreeSearch(dataset_tree.mtree)
         result_count = 0
         for path, node, remaining_pattern in tree_search.search_pattern(
@@ -333,23 +670,19 @@ def dump_from_dataset_tree(mapper: str,
                 MetadataRootRecord,
                 node.get_child(datalad_root_record_name))
 
-            yield from show_dataset_metadata(
-                mapper,
-                metadata_store,
-                root_dataset_identifier,
-                root_dataset_version,
-                path,
-                mrr)
-
-            yield from show_file_tree_metadata(
-                mapper,
-                metadata_store,
-                root_dataset_identifier,
-                root_dataset_version,
-                path,
-                mrr,
-                metadata_url.local_path,
-                recursive)
+            for batch in _all_metadata_batches(
+                    mapper,
+                    metadata_store,
+                    result_path,
+                    root_dataset_identifier,
+                    root_dataset_version,
+                    path,
+                    mrr,
+                    metadata_url.local_path,
+                    recursive,
+                    True,
+                    report_file_metadata):
+                yield from batch
 
         if result_count == 0:
             lgr.error(
@@ -378,10 +711,18 @@ def dump_from_uuid_set(mapper: str,
             f"metadata_store {mapper}:{metadata_store}")
         return
 
+    result_path = _get_result_path_factory(metadata_store)
+
+    # A non-recursive search for the empty local path does only match the
+    # root directory of a file tree, which has no metadata, so skip it.
+    report_file_metadata = recursive or path.local_path != _empty_metadata_path
+
     # Get specified version, if none is specified, take all versions.
+    # All versions are iterated lazily, in order to report the first
+    # records without collecting all versions first.
     requested_dataset_version = ([path.version]
                                  if path.version is not None
-                                 else list(version_list.versions()))
+                                 else version_list.versions())
 
     for dataset_version in requested_dataset_version:
         try:
@@ -396,25 +737,20 @@ def dump_from_uuid_set(mapper: str,
 
         assert isinstance(metadata_root_record, MetadataRootRecord)
 
-        # Show dataset-level metadata
-        yield from show_dataset_metadata(
-            mapper,
-            metadata_store,
-            path.uuid,
-            dataset_version,
-            dataset_path,
-            metadata_root_record)
-
-        # Show file-level metadata
-        yield from show_file_tree_metadata(
-            mapper,
-            metadata_store,
-            path.uuid,
-            dataset_version,
-            dataset_path,
-            metadata_root_record,
-            path.local_path,
-            recursive)
+        # Show dataset-level and file-level metadata
+        for batch in _all_metadata_batches(
+                mapper,
+                metadata_store,
+                result_path,
+                path.uuid,
+                dataset_version,
+                dataset_path,
+                metadata_root_record,
+                path.local_path,
+                recursive,
+                True,
+                report_file_metadata):
+            yield from batch
 
     return
 
@@ -551,4 +887,4 @@ class Dump(Interface):
             # logging complained about this already
             return
 
-        ui.message(json.dumps(res["metadata"]))
+        ui.message(json_dumps(res["metadata"]))
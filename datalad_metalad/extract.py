@@ -10,10 +10,11 @@
 Run a dataset-level metadata extractor on a dataset
 or run a file-level metadata extractor on a file
 """
-import json
+import concurrent.futures
 import logging
-import re
 import time
+import traceback
+from functools import lru_cache
 from os import curdir
 from pathlib import (
     Path,
@@ -30,7 +31,10 @@ from typing import (
 )
 from uuid import UUID
 
-from dataclasses import dataclass
+from dataclasses import (
+    dataclass,
+    replace,
+)
 
 from datalad.distribution.dataset import Dataset
 from datalad.distribution.dataset import (
@@ -40,8 +44,6 @@ from datalad.distribution.dataset import (
 from datalad.interface.base import Interface
 from datalad.interface.base import build_doc
 from datalad.interface.utils import eval_results
-from datalad.metadata.extractors.base import BaseMetadataExtractor
-from datalad.support.annexrepo import AnnexRepo
 from datalad.ui import ui
 
 from .extractors.base import (
@@ -65,6 +67,8 @@ from .utils import (
     NoDatasetFound,
     args_to_dict,
     check_dataset,
+    json_dumps,
+    json_loads,
 )
 
 
@@ -230,7 +234,7 @@ class Extract(Interface):
             {}
             if context is None
             else (
-                json.loads(context)
+                json_loads(context)
                 if isinstance(context, str)
                 else context))
 
@@ -248,6 +252,12 @@ class Extract(Interface):
             )
             return
 
+        # The dataset version is not cached between calls, because commits
+        # only update the branch ref, which makes a reliable invalidation
+        # as expensive as the lookup itself. Callers that extract metadata
+        # from many files should determine the version once with
+        # get_context and pass it in the context. The agent identity is
+        # read from the dataset's config manager, which caches it already.
         source_dataset_version = context.get("dataset_version", None)
         if source_dataset_version is None:
             source_dataset_version = source_dataset.repo.get_hexsha()
@@ -274,8 +284,8 @@ class Extract(Interface):
             source_dataset=source_dataset,
             source_dataset_id=UUID(source_dataset.id),
             source_dataset_version=source_dataset_version,
-            local_source_object_path=(
-                    source_dataset.pathobj / file_tree_path).absolute(),
+            # Dataset.pathobj is absolute
+            local_source_object_path=source_dataset.pathobj / file_tree_path,
             extractor_class=extractor_class,
             extractor_name=extractor_name,
             extractor_arguments=args_to_dict(extractor_args),
@@ -317,7 +327,7 @@ class Extract(Interface):
                 else {}
             )
 
-            ui.message(json.dumps({
+            ui.message(json_dumps({
                 **metadata_record,
                 **path,
                 **dataset_path,
@@ -326,7 +336,67 @@ class Extract(Interface):
 
         context = res.get("context")
         if context is not None:
-            ui.message(json.dumps(context))
+            ui.message(json_dumps(context))
+
+
+def meta_extract_many(dataset: Union[Dataset, str],
+                      extractorname: str,
+                      paths: List[str],
+                      extractorargs: Optional[List[str]] = None,
+                      context: Optional[Dict[str, str]] = None,
+                      max_workers: Optional[int] = None,
+                      processing_mode: str = "thread") -> Iterable[dict]:
+    """
+    Run a file-level metadata extractor on a number of files in a dataset.
+
+    This is the batch counterpart of meta-extract with a path argument.
+    The dataset, the extractor class, the dataset version, and the agent
+    identity are determined once for all files. The extractions are
+    performed by do_file_extraction_batch, which yields the results in
+    the order in which the extractions finish. Paths that point to a
+    directory or lie outside of the dataset lead to an error result,
+    the remaining paths are still extracted.
+    """
+    source_dataset = check_dataset(dataset, "extract metadata")
+    context = context or {}
+
+    source_dataset_version = context.get("dataset_version", None)
+    if source_dataset_version is None:
+        source_dataset_version = source_dataset.repo.get_hexsha()
+
+    extractor_class = get_extractor_class(extractorname)
+    source_dataset_id = UUID(source_dataset.id)
+    extractor_arguments = args_to_dict(extractorargs)
+    agent_name = source_dataset.config.get("user.name")
+    agent_email = source_dataset.config.get("user.email")
+
+    extraction_parameters = []
+    for path in paths:
+        try:
+            _, file_tree_path = get_path_info(
+                source_dataset,
+                Path(path),
+                None)
+            ensure_path_validity(source_dataset, file_tree_path)
+        except ValueError as e:
+            yield _get_file_error_result(source_dataset.pathobj / path, e)
+            continue
+        extraction_parameters.append(ExtractionParameter(
+            source_dataset=source_dataset,
+            source_dataset_id=source_dataset_id,
+            source_dataset_version=source_dataset_version,
+            local_source_object_path=source_dataset.pathobj / file_tree_path,
+            extractor_class=extractor_class,
+            extractor_name=extractorname,
+            extractor_arguments=extractor_arguments,
+            file_tree_path=file_tree_path,
+            agent_name=agent_name,
+            agent_email=agent_email))
+
+    yield from do_file_extraction_batch(
+        extraction_parameters,
+        max_workers,
+        processing_mode)
 
 
 def do_dataset_extraction(ep: ExtractionParameter):
@@ -359,7 +429,8 @@ def do_dataset_extraction(ep: ExtractionParameter):
     yield from perform_dataset_metadata_extraction(ep, extractor)
 
 
-def do_file_extraction(ep: ExtractionParameter):
+def do_file_extraction(ep: ExtractionParameter,
+                       file_info: Optional[FileInfo] = None):
 
     if not issubclass(ep.extractor_class, MetadataExtractorBase):
 
@@ -384,7 +455,8 @@ def do_file_extraction(ep: ExtractionParameter):
         ep.source_dataset.path,
         ep.file_tree_path)
 
-    file_info = get_file_info(ep.source_dataset, ep.file_tree_path)
+    if file_info is None:
+        file_info = get_file_info(ep.source_dataset, ep.file_tree_path)
     extractor = ep.extractor_class(
         ep.source_dataset,
         ep.source_dataset_version,
@@ -396,6 +468,134 @@ def do_file_extraction(ep: ExtractionParameter):
     yield from perform_file_metadata_extraction(ep, extractor)
 
 
+def do_file_extraction_batch(eps: List[ExtractionParameter],
+                             max_workers: Optional[int] = None,
+                             processing_mode: str = "thread"
+                             ) -> Iterable[dict]:
+    """
+    Perform file-level extractions for a number of files.
+
+    The extractions are executed by a pool of processes or threads,
+    depending on processing_mode, which is one of "process", "thread",
+    or "sequential". Results are yielded in the order in which the
+    extractions finish. Failing extractions lead to an error result.
+    """
+    # Determine the file infos of all files with a single status query
+    # per dataset, instead of one query per file. Files whose status
+    # could not be determined are reported without an extraction.
+    file_infos = []
+    for ep, (file_info, error_status) in zip(eps, _get_batch_file_infos(eps)):
+        if error_status is None:
+            file_infos.append((ep, file_info))
+        else:
+            yield _get_extraction_error_result(
+                ep,
+                ValueError(
+                    "cannot determine status of {}: {}".format(
+                        ep.local_source_object_path,
+                        _get_status_message(error_status))))
+
+    if processing_mode == "sequential":
+        for ep, file_info in file_infos:
+            try:
+                yield from _get_file_extraction_results(ep, file_info)
+            except Exception as e:
+                yield _get_extraction_error_result(ep, e)
+        return
+    elif processing_mode == "thread":
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+    elif processing_mode == "process":
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers)
+        # Dataset instances are passed to worker processes by path
+        file_infos = [
+            (replace(ep, source_dataset=ep.source_dataset.path), file_info)
+            for ep, file_info in file_infos]
+    else:
+        raise ValueError(f"unsupported processing mode: {processing_mode}")
+
+    with executor:
+        running = {
+            executor.submit(_get_file_extraction_results, ep, file_info): ep
+            for ep, file_info in file_infos}
+
+        for future in concurrent.futures.as_completed(running):
+            try:
+                yield from future.result()
+            except Exception as e:
+                yield _get_extraction_error_result(running[future], e)
+
+
+def _get_batch_file_infos(eps: List[ExtractionParameter]
+                          ) -> List[Tuple[Optional[FileInfo], Optional[Dict]]]:
+
+    # Legacy extractors determine their own status records
+    file_paths = dict()
+    for ep in eps:
+        if issubclass(ep.extractor_class, FileMetadataExtractor):
+            file_paths.setdefault(
+                ep.source_dataset.path,
+                (ep.source_dataset, []))[1].append(ep.file_tree_path)
+
+    # A single failing path, e.g. a path outside of the dataset, must
+    # not prevent the extraction of the other files.
+    path_statuses = {
+        dataset.path: _get_path_statuses(
+            dataset,
+            dataset_file_paths,
+            on_failure="ignore")
+        for dataset, dataset_file_paths in file_paths.values()}
+
+    # Files without info, e.g. untracked files, are reported by the
+    # extraction itself. Failed status queries are returned as error
+    # status.
+    file_infos = []
+    for ep in eps:
+        path_status = path_statuses.get(
+            ep.source_dataset.path, {}).get(ep.file_tree_path)
+        if path_status is None or path_status.get("state") == "untracked":
+            file_infos.append((None, None))
+        elif path_status["status"] != "ok":
+            file_infos.append((None, path_status))
+        else:
+            file_infos.append(
+                (_create_file_info(ep.source_dataset, path_status), None))
+    return file_infos
+
+
+def _get_status_message(path_status: Dict) -> str:
+    message = path_status.get("message")
+    if isinstance(message, tuple):
+        return message[0] % message[1:]
+    return str(message)
+
+
+def _get_file_extraction_results(ep: ExtractionParameter,
+                                 file_info: Optional[FileInfo] = None
+                                 ) -> List[dict]:
+    if isinstance(ep.source_dataset, str):
+        ep = replace(ep, source_dataset=Dataset(ep.source_dataset))
+    return list(do_file_extraction(ep, file_info))
+
+
+def _get_extraction_error_result(ep: ExtractionParameter,
+                                 exception: Exception) -> dict:
+    lgr.error(
+        f"Exception {exception} in extraction from "
+        f"{ep.local_source_object_path}")
+    return _get_file_error_result(ep.local_source_object_path, exception)
+
+
+def _get_file_error_result(path: Path, exception: Exception) -> dict:
+    return dict(
+        action="meta_extract",
+        status="error",
+        type="file",
+        path=str(path),
+        logger=lgr,
+        message="".join(traceback.format_exception(
+            type(exception), exception, exception.__traceback__)))
+
+
 def perform_file_metadata_extraction(ep: ExtractionParameter,
                                      extractor: FileMetadataExtractor):
 
@@ -452,11 +652,19 @@ def perform_dataset_metadata_extraction(ep: ExtractionParameter,
     yield result.datalad_result_dict
 
 
+@lru_cache(maxsize=None)
 def get_extractor_class(extractor_name: str) -> Union[
                                             Type[DatasetMetadataExtractor],
                                             Type[FileMetadataExtractor]]:
 
-    """ Get an extractor from its name """
+    """
+    Get an extractor from its name
+
+    Scanning the entry points of all installed distributions is
+    expensive, therefore the extractor classes are cached. Overridden
+    extractors are only reported when an extractor is first requested.
+    Unknown extractor names are not cached.
+    """
     from pkg_resources import iter_entry_points
 
     entry_points = list(
@@ -488,9 +696,46 @@ def get_extractor_class(extractor_name: str) -> Union[
 def get_file_info(dataset: Dataset,
                   file_path: MetadataPath) -> FileInfo:
     """
-    Get information about the file in the dataset or
-    None, if the file is not part of the dataset.
+    Get information about the file in the dataset. Raise
+    FileNotFoundError, if the file is not part of the dataset,
+    and ValueError, if the file is not tracked.
+    """
+
+    path_status = _get_path_statuses(dataset, [file_path]).get(file_path)
+
+    if path_status is None:
+        raise FileNotFoundError(
+            "no dataset status for dataset: {} file: {}".format(
+                dataset.path, _get_dataset_file_path(dataset, file_path)))
+
+    if path_status["state"] == "untracked":
+        raise ValueError("file not tracked: {}".format(
+            _get_dataset_file_path(dataset, file_path)))
+
+    return _create_file_info(dataset, path_status)
+
+
+def get_file_infos(dataset: Dataset,
+                   file_paths: List[MetadataPath]
+                   ) -> Dict[MetadataPath, FileInfo]:
+    """
+    Get information about a number of files in the dataset with
+    a single status query. Files that are not part of the dataset,
+    that are not tracked, or whose status cannot be determined, are
+    not contained in the result.
     """
+    return {
+        file_path: _create_file_info(dataset, path_status)
+        for file_path, path_status in _get_path_statuses(
+            dataset,
+            file_paths,
+            on_failure="ignore").items()
+        if path_status["status"] == "ok"
+        and path_status["state"] != "untracked"}
+
+
+def _get_dataset_file_path(dataset: Dataset,
+                           file_path: MetadataPath) -> Path:
 
     # Convert the metadata file-path into a system file path
     path = Path(file_path)
@@ -499,18 +744,29 @@ def get_file_info(dataset: Dataset,
     except ValueError:
         relative_path = path
 
-    path = dataset.pathobj / relative_path
+    return dataset.pathobj / relative_path
 
-    path_status = (
-            list(dataset.status(path, result_renderer="disabled")) or [None])[0]
 
-    if path_status is None:
-        raise FileNotFoundError(
-            "no dataset status for dataset: {} file: {}".format(
-                dataset.path, path))
+def _get_path_statuses(dataset: Dataset,
+                       file_paths: List[MetadataPath],
+                       on_failure: str = "continue"
+                       ) -> Dict[MetadataPath, Dict]:
 
-    if path_status["state"] == "untracked":
-        raise ValueError("file not tracked: {}".format(path))
+    paths = {
+        str(_get_dataset_file_path(dataset, file_path)): file_path
+        for file_path in file_paths}
+
+    return {
+        paths[path_status["path"]]: path_status
+        for path_status in dataset.status(
+            list(paths),
+            result_renderer="disabled",
+            on_failure=on_failure)
+        if path_status["path"] in paths}
+
+
+def _create_file_info(dataset: Dataset,
+                      path_status: Dict) -> FileInfo:
 
     path_relative_to_dataset = PurePath(
         path_status["path"]).relative_to(dataset.pathobj)
@@ -541,11 +797,12 @@ def get_path_info(dataset: Dataset,
     by appending it to the dataset or current directory and perform
     the above check.
     """
-    full_dataset_path = Path(dataset.path).resolve()
+    full_dataset_path = _get_resolved_path(dataset.path)
     if into_dataset_path is None:
         dataset_tree_path = MetadataPath("")
     else:
-        full_into_dataset_path = into_dataset_path.resolve()
+        full_into_dataset_path = _get_resolved_path(
+            str(into_dataset_path.absolute()))
         dataset_tree_path = MetadataPath(
             full_dataset_path.relative_to(full_into_dataset_path))
 
@@ -562,10 +819,21 @@ def get_path_info(dataset: Dataset,
     return dataset_tree_path, MetadataPath(file_tree_path)
 
 
+@lru_cache(maxsize=256)
+def _get_resolved_path(path: str) -> Path:
+    # Dataset locations are resolved for every extraction, but they are
+    # not expected to change while metadata is extracted. The path must
+    # be absolute, otherwise the result depends on the working directory.
+    return Path(path).resolve()
+
+
 def ensure_path_validity(dataset: Dataset, file_tree_path: MetadataPath):
     # TODO: there is most likely a better way to do this in datalad,
     # but I want to ensure, that we do not enumerate all sub-datasets
     # in order to perform this check on a known path.
+    # The type in the status record of the path cannot be used instead,
+    # because the status of a tracked directory consists of the records
+    # of its content, which would be enumerated before the check.
 
     full_path = dataset.pathobj / file_tree_path
     if full_path.is_dir():
@@ -626,47 +894,50 @@ def ensure_legacy_content_availability(ep: ExtractionParameter,
 
 def legacy_extract_dataset(ep: ExtractionParameter) -> Iterable[dict]:
 
+    from datalad.metadata.extractors.base import BaseMetadataExtractor
+
     if issubclass(ep.extractor_class, MetadataExtractor):
 
         status = ep.source_dataset.repo.get_submodules()
         extractor = ep.extractor_class()
         ensure_legacy_content_availability(ep, extractor, "dataset", status)
 
+        # Determine the properties that all metadata records share once
+        record_template = dict(
+            type="dataset",
+            dataset_id=ep.source_dataset_id,
+            dataset_version=ep.source_dataset_version,
+            extractor_name=ep.extractor_name,
+            extractor_version=str(
+                extractor.get_state(ep.source_dataset).get(
+                    "version", "---")),
+            extraction_parameter=ep.extractor_arguments,
+            extraction_time=time.time(),
+            agent_name=ep.agent_name,
+            agent_email=ep.agent_email)
+
         for result in extractor(ep.source_dataset,
                                 ep.source_dataset_version,
                                 "dataset",
                                 status):
 
-            yield {
+            extract_result = {
                 "status": result["status"],
                 "action": "meta_extract",
                 "path": ep.source_dataset.path,
-                "type": "dataset",
-                ** {
-                    "message": result["message"]
-                    for _ in [1]
-                    if "message" in result
-                },
-                ** (
-                    {
-                        "metadata_record": dict(
-                            type="dataset",
-                            dataset_id=ep.source_dataset_id,
-                            dataset_version=ep.source_dataset_version,
-                            extractor_name=ep.extractor_name,
-                            extractor_version=str(
-                                extractor.get_state(ep.source_dataset).get(
-                                    "version", "---")),
-                            extraction_parameter=ep.extractor_arguments,
-                            extraction_time=time.time(),
-                            agent_name=ep.agent_name,
-                            agent_email=ep.agent_email,
-                            extracted_metadata=result["metadata"])
-                    }
-                    if result["status"] == "ok"
-                    else {})
+                "type": "dataset"
             }
 
+            if "message" in result:
+                extract_result["message"] = result["message"]
+
+            if result["status"] == "ok":
+                extract_result["metadata_record"] = dict(
+                    record_template,
+                    extracted_metadata=result["metadata"])
+
+            yield extract_result
+
     elif issubclass(ep.extractor_class, BaseMetadataExtractor):
 
         # Datalad legacy extractor
@@ -719,28 +990,60 @@ def annex_status(annex_repo, paths=None):
 def legacy_get_file_info(dataset: Dataset,
                          path: Path
                          ) -> Dict:
+    return legacy_get_file_infos(dataset, [path])[path]
+
+
+def legacy_get_file_infos(dataset: Dataset,
+                          paths: List[Path]
+                          ) -> Dict[Path, Dict]:
+    """ Get the status records of a number of files with one query """
+    from datalad.support.annexrepo import AnnexRepo
+
+    path_statuses = (
+        annex_status(dataset.repo, paths)
+        if isinstance(dataset.repo, AnnexRepo)
+        else dataset.repo.status(paths, untracked="no"))
+
     return {
-        "path": str(path),
-        **(
-            annex_status(dataset.repo, [path])[path]
-            if isinstance(dataset.repo, AnnexRepo)
-            else dataset.repo.status([path], untracked="no")[path]
-        )
-    }
+        path: {
+            "path": str(path),
+            **path_statuses[path]
+        }
+        for path in paths
+        if path in path_statuses}
 
 
 def legacy_extract_file(ep: ExtractionParameter) -> Iterable[dict]:
 
+    from datalad.metadata.extractors.base import BaseMetadataExtractor
+
     if issubclass(ep.extractor_class, MetadataExtractor):
 
         # Call metalad legacy extractor with a single status record.
 
+        # Dataset.pathobj is absolute, so is file_path
         file_path = ep.source_dataset.pathobj / ep.file_tree_path
         # Determine the file type:
         extractor = ep.extractor_class()
         status = legacy_get_file_info(ep.source_dataset, file_path)
         ensure_legacy_content_availability(ep, extractor, "content", [status])
 
+        # Determine the properties that all metadata records share once
+        file_path_str = str(file_path)
+        record_template = dict(
+            type="file",
+            dataset_id=ep.source_dataset_id,
+            dataset_version=ep.source_dataset_version,
+            path=ep.file_tree_path,
+            extractor_name=ep.extractor_name,
+            extractor_version=str(
+                extractor.get_state(ep.source_dataset).get(
+                    "version", "---")),
+            extraction_parameter=ep.extractor_arguments,
+            extraction_time=time.time(),
+            agent_name=ep.agent_name,
+            agent_email=ep.agent_email)
+
         for result in extractor(ep.source_dataset,
                                 ep.source_dataset_version,
                                 "content",
@@ -751,27 +1054,16 @@ def legacy_extract_file(ep: ExtractionParameter) -> Iterable[dict]:
                     action="meta_extract",
                     status="ok",
                     type="file",
-                    path=str(file_path.absolute()),
+                    path=file_path_str,
                     metadata_record=dict(
-                        type="file",
-                        dataset_id=ep.source_dataset_id,
-                        dataset_version=ep.source_dataset_version,
-                        path=ep.file_tree_path,
-                        extractor_name=ep.extractor_name,
-                        extractor_version=str(
-                            extractor.get_state(ep.source_dataset).get(
-                                "version", "---")),
-                        extraction_parameter=ep.extractor_arguments,
-                        extraction_time=time.time(),
-                        agent_name=ep.agent_name,
-                        agent_email=ep.agent_email,
+                        record_template,
                         extracted_metadata=result["metadata"]))
             else:
                 yield dict(
                     action="meta_extract",
                     status=result["status"],
                     type="file",
-                    path=str(file_path.absolute()),
+                    path=file_path_str,
                     message=result["message"])
 
     elif issubclass(ep.extractor_class, BaseMetadataExtractor):
@@ -784,25 +1076,29 @@ def legacy_extract_file(ep: ExtractionParameter) -> Iterable[dict]:
         extractor = ep.extractor_class(ep.source_dataset, [str(ep.file_tree_path)])
         _, file_result = extractor.get_metadata(False, True)
 
+        # Determine the properties that all metadata records share once,
+        # "path" is set per record, but keeps its position in the record.
+        record_template = dict(
+            type="file",
+            dataset_id=ep.source_dataset_id,
+            dataset_version=ep.source_dataset_version,
+            path=None,
+            extractor_name=ep.extractor_name,
+            extractor_version="un-versioned",
+            extraction_parameter=ep.extractor_arguments,
+            extraction_time=time.time(),
+            agent_name=ep.agent_name,
+            agent_email=ep.agent_email)
+
         for extracted_path, metadata in file_result:
+            metadata_record = dict(record_template, extracted_metadata=metadata)
+            metadata_record["path"] = MetadataPath(extracted_path)
             yield dict(
                 action="meta_extract",
                 status="ok",
                 type="file",
                 path=path,
-                metadata_record=dict(
-                    type="file",
-                    dataset_id=ep.source_dataset_id,
-                    dataset_version=ep.source_dataset_version,
-                    path=MetadataPath(extracted_path),
-                    extractor_name=ep.extractor_name,
-                    extractor_version="un-versioned",
-                    extraction_parameter=ep.extractor_arguments,
-                    extraction_time=time.time(),
-                    agent_name=ep.agent_name,
-                    agent_email=ep.agent_email,
-                    extracted_metadata=metadata
-                ))
+                metadata_record=metadata_record)
 
     else:
         raise ValueError(
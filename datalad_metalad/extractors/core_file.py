@@ -16,6 +16,25 @@ from .base import DataOutputCategory, ExtractorResult, FileMetadataExtractor
 
 lgr = logging.getLogger('datalad.metadata.extractors.metalad_core_file')
 
+# The extractor is instantiated for every file, create its ID only once
+_core_file_id = UUID("89fae179-eceb-4af2-8088-dfebdae6e2c0")
+_core_file_version = "0.0.1"
+
+# Templates of the result dictionaries that are created for every file.
+# They are copied, because the results are modified by the caller.
+_datalad_result_template = {
+    "type": "file",
+    "status": "ok"
+}
+
+_immediate_data_template = {
+    "@id": None,
+    "type": None,
+    "path": None,
+    "content_byte_size": None,
+    "comment": "test-implementation of core_file"
+}
+
 
 class DataladCoreFileExtractor(FileMetadataExtractor):
 
@@ -26,26 +45,24 @@ class DataladCoreFileExtractor(FileMetadataExtractor):
         return True
 
     def get_id(self) -> UUID:
-        return UUID("89fae179-eceb-4af2-8088-dfebdae6e2c0")
+        return _core_file_id
 
     def get_version(self) -> str:
-        return "0.0.1"
+        return _core_file_version
 
     def extract(self, _=None) -> ExtractorResult:
+        file_info = self.file_info
+        immediate_data = _immediate_data_template.copy()
+        immediate_data["@id"] = get_file_id(dict(
+            path=file_info.path,
+            type=file_info.type))
+        immediate_data["type"] = file_info.type
+        immediate_data["path"] = file_info.intra_dataset_path
+        immediate_data["content_byte_size"] = file_info.byte_size
+
         return ExtractorResult(
             extractor_version=self.get_version(),
             extraction_parameter=self.parameter or {},
             extraction_success=True,
-            datalad_result_dict={
-                "type": "file",
-                "status": "ok"
-            },
-            immediate_data={
-                "@id": get_file_id(dict(
-                    path=self.file_info.path,
-                    type=self.file_info.type)),
-                "type": self.file_info.type,
-                "path": self.file_info.intra_dataset_path,
-                "content_byte_size": self.file_info.byte_size,
-                "comment": "test-implementation of core_file"
-            })
+            datalad_result_dict=_datalad_result_template.copy(),
+            immediate_data=immediate_data)
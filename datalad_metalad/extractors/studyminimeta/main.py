@@ -23,6 +23,12 @@ import logging
 
 import yaml
 
+# Use the faster LibYAML-based loader, if PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 from datalad.log import log_progress
 from ..base import MetadataExtractor
 from .ldcreator import LDCreator
@@ -60,8 +66,8 @@ class StudyMiniMetaExtractor(MetadataExtractor):
 
         source_file = self._get_absolute_studyminimeta_file_name(dataset)
         try:
-            with open(source_file, "rt") as input_stream:
-                metadata_object = yaml.safe_load(input_stream)
+            with open(source_file, "rb") as input_stream:
+                metadata_object = yaml.load(input_stream, Loader=SafeLoader)
         except FileNotFoundError:
             yield {
                 "status": "error",
@@ -4,17 +4,28 @@ Search through MTreeNode based trees.
 This implementation tries to keep memory usage low by:
  - using generators
  - purging MTreeNode-objects, that are not needed anymore
-
+ - not mapping leaf-objects, e.g. Metadata-objects
+
+Mapping leaves is the job of the consumer of the search results. It
+maps yielded leaves if their content is required, and purges them when
+it is done with them. Tree nodes are purged before the leaves below them
+are yielded, therefore the search never purges a leaf that the consumer
+has mapped, even if the consumer maps leaves ahead, while the search
+continues.
 """
-# TODO: unify recursive and non-recursive calls
 import enum
 import fnmatch
+import re
 from collections import deque
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import (
+    Callable,
     Generator,
+    Iterable,
     Optional,
     Tuple,
+    Type,
     Union,
 )
 
@@ -25,6 +36,29 @@ from dataladmetadatamodel.mtreenode import MTreeNode
 
 root_path = MetadataPath("")
 
+# Characters that turn a path component into a shell-style pattern
+glob_meta_characters = frozenset("*?[")
+
+
+@lru_cache(maxsize=256)
+def get_element_matcher(pattern_element: str
+                        ) -> Optional[Callable]:
+    """
+    Get a match-function for a single path component pattern.
+
+    Returns None, if pattern_element contains no shell-style
+    wildcards, i.e. if it only matches a child of the same name.
+
+    Matching is case-sensitive on all platforms, like
+    fnmatch.fnmatchcase(). Metadata paths are platform independent,
+    so a pattern matches the same elements on every platform.
+    """
+    if glob_meta_characters.isdisjoint(pattern_element):
+        return None
+    # This is the matcher that fnmatch.fnmatchcase() uses internally,
+    # the case-normalization of fnmatch.fnmatch() is deliberately omitted.
+    return re.compile(fnmatch.translate(pattern_element)).match
+
 
 @dataclass(frozen=True)
 class StackItem:
@@ -61,18 +95,25 @@ class MTreeSearch:
                        recursive: bool = False,
                        traversal_order: TraversalOrder = TraversalOrder.depth_first_search,
                        item_indicator: Optional[str] = None,
+                       node_type: Optional[Type] = None,
                        ) -> Generator[Tuple[MetadataPath, MTreeNode, Optional[MetadataPath]], None, None]:
 
         if recursive is True:
             generator_function = self._search_pattern_recursive
         else:
             generator_function = self._search_pattern
-        yield from generator_function(pattern, traversal_order, item_indicator)
+        yield from generator_function(
+            pattern,
+            traversal_order,
+            item_indicator,
+            node_type)
 
     def _search_pattern(self,
                         pattern: MetadataPath,
                         traversal_order: TraversalOrder = TraversalOrder.depth_first_search,
                         item_indicator: Optional[str] = None,
+                        node_type: Optional[Type] = None,
+                        recursive: bool = False
                         ) -> Generator[Tuple[MetadataPath, MTreeNode, Optional[MetadataPath]], None, None]:
         """
         Search the tree und yield nodes that match the pattern.
@@ -86,6 +127,12 @@ class MTreeSearch:
                         mtree-node is an item in an enclosing context,
                         for example: ".datalad_metadata-root-record"
                         could indicate a dataset-node.
+        node_type: if not None, only full-matches whose node is an
+                   instance of node_type are yielded. Matching nodes of
+                   other types are skipped before they are mapped.
+        recursive: if True, full-matches are not yielded themselves,
+                   instead the matched nodes and all nodes below them
+                   are listed, see _list_recursive.
 
         Returns:
         -------
@@ -105,9 +152,15 @@ class MTreeSearch:
         In an item match, the first element is the MetadataPath of the
         item-node, the second element is the item node, and the third
         element is a MetadataPath containing the remaining pattern.
+
+        Matched tree nodes are mapped when they are yielded, matched
+        leaves are yielded without mapping them.
         """
 
         pattern_elements = pattern.parts
+        element_matchers = [
+            get_element_matcher(pattern_element)
+            for pattern_element in pattern_elements]
 
         to_process = deque([
             StackItem(
@@ -122,13 +175,25 @@ class MTreeSearch:
             else:
                 current_item = to_process.popleft()
 
-            needs_purge = current_item.node.ensure_mapped()
+            needs_purge = self._ensure_tree_node_mapped(current_item.node)
 
             # If the current item level is equal to the number of
             # pattern elements, i.e. all pattern element were matched
             # earlier, the current item is a valid match.
             if len(pattern_elements) == current_item.item_level:
-                yield current_item.item_path, current_item.node, None
+                if recursive:
+                    # The listing purges the matched node before it
+                    # yields the leaves below the node.
+                    yield from self._list_recursive(current_item.item_path,
+                                                    current_item.node,
+                                                    traversal_order,
+                                                    item_indicator,
+                                                    node_type,
+                                                    needs_purge)
+                    continue
+
+                if node_type is None or isinstance(current_item.node, node_type):
+                    yield current_item.item_path, current_item.node, None
 
                 # There will be no further matches below the
                 # current item, because the pattern elements are
@@ -153,29 +218,83 @@ class MTreeSearch:
                     current_item.node.purge()
                 continue
 
+            # If the children would be full matches, do not consider
+            # children that are not of the requested node type. In a
+            # recursive search, the node type is only checked when
+            # listing, because matching directory nodes are the
+            # starting points of the recursive listing.
+            is_last_level = \
+                len(pattern_elements) == current_item.item_level + 1
+            required_type = \
+                node_type if is_last_level and not recursive else None
+
             # Check whether the current pattern matches any children,
             # if it does, add the children to `to_process`.
-            for child_name, child_mtree in current_item.node.child_nodes.items():
-                if fnmatch.fnmatch(child_name, pattern_elements[current_item.item_level]):
-                    # If we have an item indicator, do not append the item
-                    # indicator node
-                    if item_indicator is None or item_indicator != child_name:
-                        to_process.append(
-                            StackItem(
-                                current_item.item_path / child_name,
-                                current_item.item_level + 1,
-                                child_mtree,
-                                child_mtree.ensure_mapped()
-                            )
+            for child_name, child_mtree in self._matching_children(
+                    current_item.node,
+                    pattern_elements[current_item.item_level],
+                    element_matchers[current_item.item_level]):
+                if required_type is not None \
+                        and not isinstance(child_mtree, required_type):
+                    continue
+                # If we have an item indicator, do not append the item
+                # indicator node
+                if item_indicator is None or item_indicator != child_name:
+                    to_process.append(
+                        StackItem(
+                            current_item.item_path / child_name,
+                            current_item.item_level + 1,
+                            child_mtree,
+                            False
                         )
+                    )
 
             if needs_purge:
                 current_item.node.purge()
 
+    @staticmethod
+    def _ensure_tree_node_mapped(node: Union[MTreeNode, MappableObject]
+                                 ) -> bool:
+        """
+        Map node, if it is a tree node. Leaves are not mapped, because
+        their content is not required to search the tree. Mapping them
+        is left to the consumer of the search results.
+
+        Returns True, if the node was mapped by this call, i.e. if
+        it should be purged after processing.
+        """
+        if isinstance(node, MTreeNode):
+            return node.ensure_mapped()
+        return False
+
+    @staticmethod
+    def _matching_children(node: MTreeNode,
+                           pattern_element: str,
+                           element_matcher: Optional[Callable]
+                           ) -> Iterable[Tuple[str, MappableObject]]:
+        """
+        Yield the children of node whose names match pattern_element.
+
+        If there is no element_matcher, i.e. if pattern_element contains
+        no shell-style wildcards, the child is looked up directly,
+        instead of matching the pattern against the names of all
+        children.
+        """
+        if element_matcher is None:
+            child_node = node.child_nodes.get(pattern_element, None)
+            if child_node is not None:
+                yield pattern_element, child_node
+            return
+
+        for child_name, child_node in node.child_nodes.items():
+            if element_matcher(child_name):
+                yield child_name, child_node
+
     def _search_pattern_recursive(self,
                                   pattern: MetadataPath,
                                   traversal_order: TraversalOrder = TraversalOrder.depth_first_search,
                                   item_indicator: Optional[str] = None,
+                                  node_type: Optional[Type] = None,
                                   ) -> Generator[Tuple[MetadataPath, MTreeNode, Optional[MetadataPath]], None, None]:
         """
         Find nodes that match the given pattern and list all nodes
@@ -184,31 +303,34 @@ class MTreeSearch:
         See search_pattern for a description of the parameters and result
         elements
         """
-        for result in self._search_pattern(pattern,
-                                           traversal_order,
-                                           item_indicator):
-            if result[2] is not None:
-                # Do not recursively list item-matches.
-                yield result
-            else:
-                yield from self._list_recursive(result[0],
-                                                result[1],
-                                                traversal_order,
-                                                item_indicator)
+        # Item-matches are not listed recursively
+        yield from self._search_pattern(pattern,
+                                        traversal_order,
+                                        item_indicator,
+                                        node_type,
+                                        recursive=True)
 
     def _list_recursive(self,
                         start_path: MetadataPath,
                         start_node: MTreeNode,
                         traversal_order: TraversalOrder = TraversalOrder.depth_first_search,
                         item_indicator: Optional[str] = None,
+                        node_type: Optional[Type] = None,
+                        start_needs_purge: bool = False
                         ):
+        """
+        List start_node and all nodes below it. If start_needs_purge is
+        True, start_node was mapped by the caller, and is purged, like
+        all nodes that are mapped by the listing, before the nodes below
+        it are yielded.
+        """
 
         to_process = deque([
             StackItem(
                 start_path,
                 0,
                 start_node,
-                False)])
+                start_needs_purge)])
 
         while to_process:
             if traversal_order == TraversalOrder.depth_first_search:
@@ -216,7 +338,9 @@ class MTreeSearch:
             else:
                 current_item = to_process.popleft()
 
-            needs_purge = current_item.node.ensure_mapped()
+            needs_purge = \
+                self._ensure_tree_node_mapped(current_item.node) \
+                or current_item.needs_purge
 
             # Check for item-node, if item indicator is not None
             if isinstance(current_item.node, MTreeNode):
@@ -228,6 +352,10 @@ class MTreeSearch:
                     # If we have an item indicator, do not append the item
                     # indicator node
                     if item_indicator is None or item_indicator != child_name:
+                        # Skip leaves that are not of the requested type
+                        if node_type is not None \
+                                and not isinstance(child_node, (MTreeNode, node_type)):
+                            continue
                         to_process.append(
                             StackItem(
                                 current_item.item_path / child_name,
@@ -240,7 +368,8 @@ class MTreeSearch:
                 if item_indicator is None:
                     # If we are at a leaf and there is no item_indicator,
                     # yield the leave.
-                    yield current_item.item_path, current_item.node, None
+                    if node_type is None or isinstance(current_item.node, node_type):
+                        yield current_item.item_path, current_item.node, None
 
             # We are done with this node. Purge it, if it was
             # not present in memory before this search.
@@ -3,6 +3,7 @@ from typing import (
     Any,
     List,
 )
+from unittest.mock import patch
 
 from dataladmetadatamodel.datasettree import datalad_root_record_name
 from dataladmetadatamodel.metadata import Metadata
@@ -110,3 +111,109 @@ class TestTreeSearchMatching(TestMTreeSearchBase):
                 MetadataPath("dataset_0.1/dataset_0.1.2"),
                 MetadataPath("dataset_0.1")]:
             self.assertIn(expected_path, [result[0] for result in results])
+
+    def test_literal_pattern(self):
+        results = list(
+            self.mtree_search.search_pattern(
+                pattern=MetadataPath("dataset_0.0/dataset_0.0.1")))
+        self.assertEqual(len(results), 1)
+        self.assertEqual(
+            results[0][0],
+            MetadataPath("dataset_0.0/dataset_0.0.1"))
+
+        results = list(
+            self.mtree_search.search_pattern(
+                pattern=MetadataPath("dataset_0.0/does_not_exist")))
+        self.assertEqual(results, [])
+
+    def test_literal_pattern_item_detection(self):
+        results = list(
+            self.mtree_search.search_pattern(
+                pattern=MetadataPath("dataset_0.1/dataset_0.1.2"),
+                item_indicator=datalad_root_record_name))
+
+        self.assertEqual(
+            [result[0] for result in results],
+            [
+                MetadataPath(""),
+                MetadataPath("dataset_0.1"),
+                MetadataPath("dataset_0.1/dataset_0.1.2")
+            ])
+
+    def test_node_type_filter(self):
+        results = list(
+            self.mtree_search.search_pattern(
+                pattern=MetadataPath("*"),
+                node_type=Metadata))
+        self.assertEqual(
+            [result[0] for result in results],
+            [MetadataPath(datalad_root_record_name)])
+
+        results = list(
+            self.mtree_search.search_pattern(
+                pattern=MetadataPath("d3"),
+                recursive=True,
+                node_type=Metadata))
+        self.assertEqual(
+            sorted(result[0] for result in results),
+            [
+                MetadataPath("d3") / datalad_root_record_name,
+                MetadataPath("d3/some_file")
+            ])
+
+        results = list(
+            self.mtree_search.search_pattern(
+                pattern=MetadataPath("d3"),
+                node_type=Metadata))
+        self.assertEqual(results, [])
+
+    def test_recursive_purge_order(self):
+        # Matched tree nodes are purged before the leaves below them
+        # are yielded, so the search never purges a yielded leaf.
+        events = []
+        mapped_nodes = []
+
+        def ensure_tree_node_mapped(node):
+            if not isinstance(node, MTreeNode) or node in mapped_nodes:
+                return False
+            mapped_nodes.append(node)
+            return True
+
+        def record_purge(node):
+            mapped_nodes.remove(node)
+            events.append(("purge", node))
+
+        with patch.object(MTreeSearch,
+                          "_ensure_tree_node_mapped",
+                          staticmethod(ensure_tree_node_mapped)), \
+                patch.object(MTreeNode, "purge", record_purge):
+
+            for pattern in ("", "d3"):
+                events.clear()
+                for path, node, _ in self.mtree_search.search_pattern(
+                        pattern=MetadataPath(pattern),
+                        recursive=True,
+                        node_type=Metadata):
+                    events.append(("yield", path))
+
+                matched_node = self.mtree_search.mtree.get_object_at_path(
+                    MetadataPath(pattern))
+                first_yield = min(
+                    index
+                    for index, event in enumerate(events)
+                    if event[0] == "yield")
+                self.assertIn(
+                    ("purge", matched_node),
+                    events[:first_yield])
+
+    def test_case_sensitive_matching(self):
+        # Matching does not depend on the case-normalization of the
+        # platform, simulate a case-insensitive platform
+        with patch("os.path.normcase", str.lower):
+            for pattern, expected_paths in (("D*", []),
+                                            ("d*", ["d3", "dataset_0.0", "dataset_0.1"])):
+                found_paths = [
+                    str(path)
+                    for path, _, _ in self.mtree_search.search_pattern(
+                        pattern=MetadataPath(pattern))]
+                self.assertEqual(sorted(found_paths), expected_paths)
@@ -1,9 +1,11 @@
-import json
-from copy import deepcopy
+import sys
+from copy import copy, deepcopy
 from enum import Enum
 from dataclasses import dataclass, field
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from .utils import json_dumps_bytes
+
 
 class ResultState(Enum):
     SUCCESS = "success"
@@ -16,17 +18,59 @@ class PipelineElementState(Enum):
     STOP = "stop"
 
 
+# Names of the enum values, used when converting to JSON
+_result_state_names = {state: state.name for state in ResultState}
+_element_state_names = {state: state.name for state in PipelineElementState}
+
+# JSON representations of results without error and message
+_plain_result_json = {
+    state: {"state": state.name}
+    for state in ResultState
+}
+
+# Values of these types are deep-copied when results or pipeline
+# elements are copied, all other values are considered immutable, e.g.
+# paths, strings, or enums, and are shared by the copies.
+_mutable_types = (dict, list, set)
+
+
+def _copy_mutable(value: Any) -> Any:
+    return deepcopy(value) if isinstance(value, _mutable_types) else value
+
+
 @dataclass
 class PipelineResult:
     state: ResultState
     base_error: Optional[Dict] = field(init=False)
 
+    # Not a dataclass field, instances only store a message that is
+    # assigned to them.
+    message = ""
+
     def __post_init__(self):
-        self.message = ""
         self.base_error = None
 
+    def clone(self) -> "PipelineResult":
+        """
+        Copy the result, including the fields of derived result classes.
+        Mutable field values, e.g. base_error or a metadata_record dict,
+        are deep-copied, so that processors can modify them in place
+        without affecting the original result.
+        """
+        result = copy(self)
+        for name, value in list(vars(result).items()):
+            if isinstance(value, _mutable_types):
+                setattr(result, name, deepcopy(value))
+        return result
+
     def to_json(self) -> Dict:
-        result = dict(state=self.state.name)
+        # The JSON representation is not cached, because processors
+        # modify results after their creation, e.g. by assigning
+        # base_error, and to_json is only called once per result
+        # when the pipeline element leaves the pipeline.
+        if self.base_error is None and not self.message:
+            return _plain_result_json[self.state].copy()
+        result = dict(state=_result_state_names[self.state])
         if self.base_error is not None:
             result["error"] = self.base_error
         if self.message:
@@ -35,11 +79,25 @@ class PipelineResult:
 
 
 class PipelineElement:
+    __slots__ = ("_result", "_dynamic", "_path_str", "state")
+
     def __init__(self,
                  initial_result: Optional[Iterable[Tuple[str, List[PipelineResult]]]] = None):
 
-        self._result: Dict[str, List[PipelineResult]] = dict(initial_result or ())
+        # Result types are interned when they are stored, that lets
+        # lookups with the interned result type literals of the
+        # processors succeed on identity. Result lists are copied, so
+        # that adding results does not modify the caller's lists.
+        # Non-list entries, i.e. "path", are stored as they are.
+        self._result: Dict[str, List[PipelineResult]] = {
+            sys.intern(result_type): (
+                list(value)
+                if isinstance(value, list)
+                else value)
+            for result_type, value in (initial_result or ())
+        }
         self._dynamic = dict()
+        self._path_str: Optional[str] = None
         self.state = PipelineElementState.CONTINUE
 
     def get_dynamic_data(self, key: str, default=None) -> Any:
@@ -49,25 +107,43 @@ class PipelineElement:
         self._dynamic[key] = data
 
     def add_result(self, result_type: str, result: PipelineResult):
-        if result_type not in self._result:
-            self._result[result_type] = []
-        self._result[result_type].append(result)
+        self._result.setdefault(sys.intern(result_type), []).append(result)
 
     def add_result_list(self, result_type: str, results: List[PipelineResult]):
-        if result_type not in self._result:
-            self._result[result_type] = []
-        self._result[result_type].extend(results)
+        self._result.setdefault(sys.intern(result_type), []).extend(results)
 
     def set_result(self, result_type: str, result_list: List[PipelineResult]):
-        self._result[result_type] = result_list
+        if result_type == "path":
+            self._path_str = None
+        self._result[sys.intern(result_type)] = result_list
+
+    def set_path(self, path: Any):
+        self._result["path"] = path
+        self._path_str = str(path)
 
     def get_result(self, result_type: str) -> Optional[List[PipelineResult]]:
         return self._result.get(result_type, None)
 
     def copy(self) -> "PipelineElement":
+        """
+        Copy the pipeline element. Results are copied by their clone()
+        method, mutable dynamic data values are deep-copied, immutable
+        values, e.g. the path, are shared with the copy.
+        """
         new_pipeline_element = PipelineElement()
-        new_pipeline_element._dynamic = deepcopy(self._dynamic)
-        new_pipeline_element._result = deepcopy(self._result)
+        new_pipeline_element._dynamic = {
+            key: _copy_mutable(value)
+            for key, value in self._dynamic.items()
+        }
+        new_pipeline_element._result = {
+            key: (
+                [result.clone() for result in value]
+                if isinstance(value, list)
+                else value)
+            for key, value in self._result.items()
+        }
+        new_pipeline_element._path_str = self._path_str
+        new_pipeline_element.state = self.state
         return new_pipeline_element
 
     def __str__(self):
@@ -79,7 +155,7 @@ class PipelineElement:
 
     def to_json(self) -> Dict:
         json_obj = {
-            "state": self.state.name,
+            "state": _element_state_names[self.state],
             "result": {
                 key: [
                     result.to_json()
@@ -89,5 +165,10 @@ class PipelineElement:
                 if key not in ("path",)
             }
         }
-        json_obj["result"]["path"] = str(self._result["path"])
+        if self._path_str is None:
+            self._path_str = str(self._result["path"])
+        json_obj["result"]["path"] = self._path_str
         return json_obj
+
+    def to_bytes(self) -> bytes:
+        return json_dumps_bytes(self.to_json())
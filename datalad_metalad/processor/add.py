@@ -104,7 +104,7 @@ class MetadataAdder(Processor):
                 path = add_result["path"]
                 if add_result["status"] == "ok":
                     md_add_result = MetadataAddResult(ResultState.SUCCESS, path)
-                    pipeline_element.set_result("path", path)
+                    pipeline_element.set_path(path)
                 else:
                     md_add_result = MetadataAddResult(ResultState.FAILURE, path)
                     md_add_result.base_error = add_result
@@ -98,6 +98,18 @@ class MetadataExtractor(Processor):
                 md_extractor_result.metadata_record = extract_result["metadata_record"]
                 md_extractor_result.context = None
 
+                # Provide the content size of files, e.g. reported by
+                # metalad_core, to following processors, without
+                # requiring them to parse the extracted metadata.
+                extracted_metadata = extract_result["metadata_record"].get(
+                    "extracted_metadata")
+                if object_type == "file" \
+                        and isinstance(extracted_metadata, dict) \
+                        and "content_byte_size" in extracted_metadata:
+                    pipeline_element.set_dynamic_data(
+                        "content_byte_size",
+                        extracted_metadata["content_byte_size"])
+
             else:
                 md_extractor_result = MetadataExtractorResult(ResultState.FAILURE, path)
                 md_extractor_result.base_error = extract_result
@@ -13,6 +13,8 @@ from dataclasses import dataclass
 from itertools import chain
 from pathlib import Path
 from typing import Dict
+from unittest.mock import patch
+from uuid import UUID
 
 from datalad.api import meta_conduct
 from datalad.tests.utils import (
@@ -28,7 +30,12 @@ from ..pipelineelement import (
     ResultState,
 )
 from ..processor.base import Processor
+from ..processor.extract import (
+    MetadataExtractor,
+    MetadataExtractorResult,
+)
 from ..provider.base import Provider
+from ..provider.datasettraverse import DatasetTraverseResult
 
 
 test_tree = {
@@ -238,3 +245,112 @@ def test_multiple_adder():
     assert_equal(len(adder_results), adder_count)
     for i in range(adder_count):
         assert_equal(adder_results[i]["content"], f"content from adder {i}")
+
+
+def test_pipeline_element_copy():
+    result = TestResult(ResultState.SUCCESS, Path("a/b"))
+    result.base_error = {"reason": "test"}
+    pipeline_element = PipelineElement((
+        ("path", Path("a/b")),
+        ("test-traversal-record", [result])
+    ))
+    pipeline_element.set_dynamic_data("key", "value")
+    pipeline_element.set_dynamic_data("list", [{"a": 1}])
+
+    element_copy = pipeline_element.copy()
+    assert_equal(element_copy.to_json(), pipeline_element.to_json())
+    assert_equal(element_copy.get_dynamic_data("key"), "value")
+
+    # The results in the copy are independent of the original results
+    result_copy = element_copy.get_result("test-traversal-record")[0]
+    assert_true(isinstance(result_copy, TestResult))
+    result_copy.path = Path("c")
+    assert_equal(result.path, Path("a/b"))
+
+    # Mutable values can be modified in place in one of the elements only
+    result_copy.base_error["reason"] = "modified"
+    assert_equal(result.base_error, {"reason": "test"})
+    element_copy.get_dynamic_data("list")[0]["a"] = 2
+    assert_equal(pipeline_element.get_dynamic_data("list"), [{"a": 1}])
+
+    # Immutable values are shared
+    assert_true(result_copy.state is result.state)
+    assert_true(
+        element_copy.get_result("path") is pipeline_element.get_result("path"))
+
+
+def test_pipeline_result_clone_metadata_record():
+    result = MetadataExtractorResult(ResultState.SUCCESS, "/ds/a")
+    result.metadata_record = {"dataset_id": UUID(int=1), "path": Path("a")}
+
+    result_copy = result.clone()
+    assert_true(isinstance(result_copy, MetadataExtractorResult))
+    assert_equal(result_copy.metadata_record, result.metadata_record)
+
+    # e.g. the add processor converts the values of the record in place
+    result_copy.metadata_record["dataset_id"] = str(
+        result_copy.metadata_record["dataset_id"])
+    assert_equal(result.metadata_record["dataset_id"], UUID(int=1))
+
+
+def test_pipeline_element_to_bytes():
+    pipeline_element = PipelineElement((
+        ("path", Path("a/b")),
+        ("adder-data", [StringResult(ResultState.SUCCESS, "content")])
+    ))
+    assert_equal(
+        json.loads(pipeline_element.to_bytes()),
+        pipeline_element.to_json())
+
+
+def test_pipeline_element_owns_result_lists():
+    initial_results = [TestResult(ResultState.SUCCESS, Path("a"))]
+    pipeline_element = PipelineElement((
+        ("path", Path("a")),
+        ("test-traversal-record", initial_results)
+    ))
+    pipeline_element.add_result(
+        "test-traversal-record",
+        TestResult(ResultState.SUCCESS, Path("b")))
+
+    assert_equal(len(initial_results), 1)
+    assert_equal(
+        len(pipeline_element.get_result("test-traversal-record")), 2)
+    assert_equal(pipeline_element.get_result("path"), Path("a"))
+
+
+def _process_file_extraction(extractor_name: str,
+                             extracted_metadata: Dict) -> PipelineElement:
+    traverse_result = DatasetTraverseResult(
+        ResultState.SUCCESS, Path("/ds"), "file", Path(""),
+        "id", "v", Path("/ds/a"), "id", "v")
+    pipeline_element = PipelineElement((
+        ("path", Path("/ds/a")),
+        ("dataset-traversal-record", [traverse_result])
+    ))
+    extract_results = [{
+        "status": "ok",
+        "path": "a",
+        "metadata_record": {
+            "extractor_name": extractor_name,
+            "extracted_metadata": extracted_metadata
+        }
+    }]
+    with patch("datalad_metalad.processor.extract.meta_extract",
+               return_value=extract_results):
+        return MetadataExtractor("file", extractor_name).process(
+            pipeline_element)
+
+
+def test_extract_content_byte_size():
+    pipeline_element = _process_file_extraction(
+        "metalad_core_file",
+        {"path": "a", "type": "file", "content_byte_size": 11})
+    assert_equal(pipeline_element.get_dynamic_data("content_byte_size"), 11)
+    assert_equal(len(pipeline_element.get_result("metadata")), 1)
+
+    pipeline_element = _process_file_extraction(
+        "other_file_extractor",
+        {"path": "a", "comment": "no size"})
+    assert_equal(pipeline_element.get_dynamic_data("content_byte_size"), None)
+    assert_equal(len(pipeline_element.get_result("metadata")), 1)
@@ -0,0 +1,220 @@
+# emacs: -*- mode: python-mode; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# -*- coding: utf-8 -*-
+# ex: set sts=4 ts=4 sw=4 noet:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Test metadata dumping helpers"""
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import UUID
+
+from datalad.tests.utils import (
+    assert_equal,
+    assert_false,
+    assert_raises,
+    assert_true,
+)
+from dataladmetadatamodel.filetree import FileTree
+from dataladmetadatamodel.metadata import Metadata
+from dataladmetadatamodel.metadatapath import MetadataPath
+
+from ..dump import (
+    _is_remote_store,
+    _matches_directory,
+    _prefetch_mapped,
+    max_prefetch_window,
+    show_all_metadata,
+    show_dataset_metadata,
+    show_file_tree_metadata,
+)
+from ..pathutils.mtreesearch import MTreeSearch
+
+
+class MappingRecorder:
+    def __init__(self, mapped: bool = False):
+        self.mapped = mapped
+        self.purged = False
+
+    def ensure_mapped(self) -> bool:
+        if self.mapped:
+            return False
+        self.mapped = True
+        return True
+
+    def purge(self):
+        self.mapped = False
+        self.purged = True
+
+
+class RecordedMetadata(Metadata):
+    """ Metadata with a single, fixed extractor run """
+    def __init__(self, content: str):
+        super().__init__()
+        self.content = content
+
+    def extractor_runs(self):
+        return [(
+            "test_extractor",
+            [SimpleNamespace(
+                time_stamp=1.0,
+                author_name="tester",
+                author_email="tester@example.com",
+                configuration=SimpleNamespace(version="1", parameter={}),
+                metadata_content={"content": self.content})])]
+
+
+class RootRecordRecorder(MappingRecorder):
+    def __init__(self, file_paths):
+        super().__init__()
+        self.map_count = 0
+        self.dataset_identifier = UUID(int=1)
+        self.dataset_version = "v1"
+        self.dataset_level_metadata = RecordedMetadata("dataset")
+        self.file_tree = FileTree()
+        for file_path in file_paths:
+            self.file_tree.add_metadata(
+                MetadataPath(file_path),
+                RecordedMetadata(file_path))
+
+    def ensure_mapped(self) -> bool:
+        needs_purge = super().ensure_mapped()
+        self.map_count += needs_purge
+        return needs_purge
+
+
+def test_prefetch_mapped_order():
+    objects = [MappingRecorder(index % 2 == 0) for index in range(200)]
+    results = list(_prefetch_mapped(objects))
+    assert_equal([result[0] for result in results], objects)
+    assert_equal(
+        [result[1] for result in results],
+        [index % 2 == 1 for index in range(200)])
+    assert_true(all(recorder.mapped for recorder in objects))
+
+
+def test_prefetch_mapped_lazy():
+    objects = [MappingRecorder() for _ in range(200)]
+    taken = []
+
+    def generate_objects():
+        for recorder in objects:
+            taken.append(recorder)
+            yield recorder
+
+    prefetcher = _prefetch_mapped(generate_objects())
+    first_object, _ = next(prefetcher)
+    assert_equal(first_object, objects[0])
+
+    # Only objects within the prefetch window are taken from the input
+    assert_true(len(taken) <= max_prefetch_window + 1)
+    assert_equal(
+        [result[0] for result in prefetcher],
+        objects[1:])
+    assert_equal(len(taken), len(objects))
+
+
+def test_prefetch_mapped_single():
+    recorder = MappingRecorder()
+    assert_equal(list(_prefetch_mapped([recorder])), [(recorder, True)])
+    assert_equal(list(_prefetch_mapped([recorder])), [(recorder, False)])
+
+
+def test_prefetch_mapped_early_stop():
+    objects = [MappingRecorder() for _ in range(20)]
+    prefetcher = _prefetch_mapped(objects)
+    first_object, needs_purge = next(prefetcher)
+    assert_true(needs_purge)
+    prefetcher.close()
+
+    # Objects that were mapped ahead, but not yielded, are purged
+    assert_true(first_object.mapped)
+    assert_false(any(recorder.mapped for recorder in objects[1:]))
+
+
+class FailingMappingRecorder(MappingRecorder):
+    def ensure_mapped(self) -> bool:
+        raise RuntimeError("mapping failed")
+
+
+def test_prefetch_mapped_failed_cleanup():
+    for stop in ("close", "throw"):
+        objects = [MappingRecorder() for _ in range(20)]
+        objects[2] = FailingMappingRecorder()
+        prefetcher = _prefetch_mapped(objects)
+        next(prefetcher)
+
+        # A failed mapping of an object that was not yielded does not
+        # replace the propagating exception
+        if stop == "close":
+            prefetcher.close()
+        else:
+            assert_raises(KeyError, prefetcher.throw, KeyError("consumer"))
+
+        # The other objects that were mapped ahead are still purged
+        assert_false(any(recorder.mapped for recorder in objects[1:]))
+
+
+def test_prefetch_mapped_sequential():
+    objects = [MappingRecorder(index % 2 == 0) for index in range(20)]
+    with patch("concurrent.futures.ThreadPoolExecutor") as executor:
+        results = list(_prefetch_mapped(iter(objects), False))
+    executor.assert_not_called()
+    assert_equal(
+        results,
+        [(recorder, index % 2 == 1) for index, recorder in enumerate(objects)])
+
+
+def test_remote_store_detection():
+    assert_true(_is_remote_store("https://example.com/metadata"))
+    assert_false(_is_remote_store("/tmp/metadata"))
+    assert_false(_is_remote_store(Path("/tmp/metadata")))
+
+
+def test_matches_directory():
+    file_tree = FileTree()
+    for path in ("a/b/c", "a/d", "e"):
+        file_tree.add_metadata(MetadataPath(path), Metadata())
+    tree_search = MTreeSearch(file_tree.mtree)
+
+    for pattern in ("", "a", "a/b", "*"):
+        assert_true(_matches_directory(tree_search, MetadataPath(pattern)))
+    for pattern in ("e", "a/d", "a/b/c", "x", "a/x"):
+        assert_false(_matches_directory(tree_search, MetadataPath(pattern)))
+
+
+def test_show_metadata():
+    def show(function, *args, **kwargs):
+        root_record = RootRecordRecorder(["a/b", "a/c", "d"])
+        results = list(function(
+            "git", Path("/tmp/store"), UUID(int=1), "v1", MetadataPath(""),
+            root_record, *args, **kwargs))
+        return root_record, [
+            (result["metadata"]["type"],
+             result["metadata"]["extracted_metadata"]["content"])
+            for result in results]
+
+    root_record, all_results = show(
+        show_all_metadata, MetadataPath("a"), True)
+    assert_equal(
+        all_results,
+        [("dataset", "dataset"), ("file", "a/c"), ("file", "a/b")])
+
+    # The root record is mapped only once for both kinds of records
+    assert_equal(root_record.map_count, 1)
+    assert_true(root_record.purged)
+
+    _, dataset_results = show(show_dataset_metadata)
+    assert_equal(dataset_results, all_results[:1])
+
+    _, file_results = show(show_file_tree_metadata, MetadataPath("a"), True)
+    assert_equal(file_results, all_results[1:])
+
+    _, file_results = show(
+        show_all_metadata, MetadataPath("d"), False,
+        report_dataset_metadata=False)
+    assert_equal(file_results, [("file", "d")])
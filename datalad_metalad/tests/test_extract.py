@@ -9,6 +9,7 @@
 # ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
 """Test metadata extraction"""
 import subprocess
+from pathlib import Path
 from uuid import UUID
 from typing import Optional
 from unittest.mock import patch
@@ -22,6 +23,7 @@ from datalad.tests.utils import (
     assert_raises,
     assert_result_count,
     assert_in,
+    assert_true,
     eq_,
     known_failure_windows,
     with_tempfile,
@@ -30,7 +32,12 @@ from datalad.tests.utils import (
 
 from dataladmetadatamodel.metadatapath import MetadataPath
 
-from ..extract import get_extractor_class
+from ..extract import (
+    ExtractionParameter,
+    do_file_extraction_batch,
+    get_extractor_class,
+    meta_extract_many,
+)
 
 
 meta_tree = {
@@ -59,6 +66,29 @@ def test_unknown_extractor_error(path):
             meta_extract, extractorname="bogus__")
 
 
+def test_extractor_class_lookup_cache():
+    get_extractor_class.cache_clear()
+    extractor_class = get_extractor_class("metalad_core_file")
+    eq_(get_extractor_class("metalad_core_file"), extractor_class)
+    eq_(get_extractor_class.cache_info().misses, 1)
+    eq_(get_extractor_class.cache_info().hits, 1)
+
+    # Unknown extractors are reported on every request
+    assert_raises(ValueError, get_extractor_class, "bogus__")
+    assert_raises(ValueError, get_extractor_class, "bogus__")
+
+
+@with_tempfile(mkdir=True)
+def test_dataset_path_is_absolute(path):
+    # Extraction relies on absolute dataset paths to build absolute
+    # file paths without calling Path.absolute()
+    with chpwd(path):
+        for dataset_path in ("ds", "./ds", "sub/../ds"):
+            dataset = Dataset(dataset_path)
+            assert_true(dataset.pathobj.is_absolute())
+            eq_(dataset.pathobj, Path(path).resolve() / "ds")
+
+
 def _check_metadata_record(metadata_record: dict,
                            dataset: Dataset,
                            extractor_name: str,
@@ -159,6 +189,101 @@ def test_file_extraction_result(ds_path):
     eq_(extracted_metadata["comment"], "test-implementation of core_file")
 
 
+@with_tree(meta_tree)
+def test_file_extraction_batch(ds_path):
+
+    ds = Dataset(ds_path).create(force=True)
+    ds.save()
+    assert_repo_status(ds.path)
+
+    extractor_name = "metalad_core_file"
+    extraction_parameters = [
+        ExtractionParameter(
+            source_dataset=ds,
+            source_dataset_id=UUID(ds.id),
+            source_dataset_version=ds.repo.get_hexsha(),
+            local_source_object_path=ds.pathobj / file_path,
+            extractor_class=get_extractor_class(extractor_name),
+            extractor_name=extractor_name,
+            extractor_arguments={},
+            file_tree_path=MetadataPath(file_path),
+            agent_name="DataLad Tester",
+            agent_email="test@example.com")
+        for file_path in (
+            "sub/one",
+            "sub/nothing",
+            "sub/missing",
+            "../outside")]
+
+    for processing_mode in ("sequential", "thread", "process"):
+        res = list(do_file_extraction_batch(
+            extraction_parameters,
+            processing_mode=processing_mode))
+
+        assert_result_count(res, 4, type="file")
+        assert_result_count(res, 2, status="ok")
+        assert_result_count(
+            res, 1,
+            status="error",
+            path=str(ds.pathobj / "sub/missing"))
+
+        # A path outside of the dataset does not abort the batch
+        assert_result_count(
+            res, 1,
+            status="error",
+            path=str(ds.pathobj / "../outside"))
+        eq_(
+            sorted(
+                str(result["metadata_record"]["path"])
+                for result in res
+                if result["status"] == "ok"),
+            ["sub/nothing", "sub/one"])
+
+    assert_raises(
+        ValueError,
+        list,
+        do_file_extraction_batch(extraction_parameters, processing_mode="x"))
+
+
+@with_tree(meta_tree)
+def test_meta_extract_many(ds_path):
+
+    ds = Dataset(ds_path).create(force=True)
+    ds.save()
+    assert_repo_status(ds.path)
+
+    res = list(meta_extract_many(
+        ds,
+        "metalad_core_file",
+        ["sub/one", str(ds.pathobj / "sub" / "nothing")],
+        processing_mode="thread"))
+
+    assert_result_count(res, 2, status="ok", type="file")
+    for result in res:
+        _check_metadata_record(
+            metadata_record=result["metadata_record"],
+            dataset=ds,
+            extractor_name="metalad_core_file",
+            extractor_version=get_extractor_class(
+                "metalad_core_file")(None, None, None).get_version(),
+            extraction_parameter={})
+
+    # Directories and paths outside of the dataset lead to error results,
+    # the remaining paths are still extracted
+    res = list(meta_extract_many(
+        ds,
+        "metalad_core_file",
+        ["sub/one", "sub", "../outside"]))
+
+    assert_result_count(res, 3, type="file")
+    assert_result_count(res, 1, status="ok")
+    assert_result_count(res, 1, status="error", path=str(ds.pathobj / "sub"))
+    assert_result_count(
+        res, 1,
+        status="error",
+        path=str(ds.pathobj / "../outside"))
+
+
 @with_tree(meta_tree)
 def test_legacy1_dataset_extraction_result(ds_path):
 
@@ -0,0 +1,110 @@
+# emacs: -*- mode: python-mode; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# -*- coding: utf-8 -*-
+# ex: set sts=4 ts=4 sw=4 noet:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Test JSON serialization helpers"""
+import datetime
+import enum
+import json
+import math
+from dataclasses import dataclass
+from unittest.mock import patch
+from uuid import UUID
+
+from datalad.tests.utils import (
+    assert_raises,
+    assert_true,
+    eq_,
+)
+
+from .. import utils
+from ..utils import (
+    json_dumps,
+    json_dumps_bytes,
+    json_loads,
+)
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+class Size(enum.IntEnum):
+    LARGE = 3
+
+
+@dataclass
+class Point:
+    x: int
+
+
+test_uuid = UUID("00000000-0000-0000-0000-000000000001")
+
+test_objects = [
+    {"a": 1, "b": [1.5, True, None], "c": {"d": "ä€"}},
+    {"a": float("nan"), "b": [None, float("inf"), -float("inf")]},
+    {"floats": [1e16, 1e-7, 0.1, -2.5e300, 1.0]},
+    {"large": 2 ** 70},
+    {1: "non string key", None: 2},
+    {"uuid": test_uuid, "enum": [Color.RED, Size.LARGE]},
+]
+
+unserializable_objects = [
+    {"point": Point(1)},
+    {"date": datetime.date(2020, 1, 1)},
+    {"set": {1}},
+    {test_uuid: "uuid key"},
+    {Color.RED: "enum key"},
+]
+
+
+def _dump_with_stdlib(obj):
+    with patch.object(utils, "orjson", None):
+        return json_dumps(obj), json_dumps_bytes(obj)
+
+
+def test_json_dumps_stdlib_format():
+    # Without orjson the output is formatted like the output of json.dumps
+    eq_(_dump_with_stdlib(test_objects[0]),
+        (json.dumps(test_objects[0]), json.dumps(test_objects[0]).encode()))
+    eq_(_dump_with_stdlib(test_objects[2])[0],
+        '{"floats": [1e+16, 1e-07, 0.1, -2.5e+300, 1.0]}')
+
+
+def test_json_dumps_backend_independence():
+    for obj in test_objects:
+        expected, expected_bytes = _dump_with_stdlib(obj)
+        # compare representations, because NaN is not equal to NaN
+        eq_(repr(json_loads(json_dumps(obj))), repr(json_loads(expected)))
+        eq_(repr(json_loads(json_dumps_bytes(obj))),
+            repr(json_loads(expected_bytes)))
+
+    eq_(json_loads(json_dumps(test_objects[5])),
+        {"uuid": str(test_uuid), "enum": ["red", 3]})
+
+    # Non-finite floats are written identically by both backends
+    eq_(json_dumps(test_objects[1]),
+        _dump_with_stdlib(test_objects[1])[0])
+
+
+def test_json_dumps_rejects_same_objects():
+    for obj in unserializable_objects:
+        assert_raises(TypeError, json_dumps, obj)
+        assert_raises(TypeError, json_dumps_bytes, obj)
+        with patch.object(utils, "orjson", None):
+            assert_raises(TypeError, json_dumps, obj)
+            assert_raises(TypeError, json_dumps_bytes, obj)
+
+
+def test_json_loads_non_finite():
+    for json_string in ('{"a":NaN,"b":[null,Infinity]}',
+                        b'{"a":NaN,"b":[null,Infinity]}'):
+        result = json_loads(json_string)
+        assert_true(math.isnan(result["a"]))
+        eq_(result["b"], [None, float("inf")])
+    assert_raises(ValueError, json_loads, '{"a":')
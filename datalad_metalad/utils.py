@@ -1,5 +1,7 @@
+import enum
 import glob
 import json
+import math
 import os.path as op
 import pkg_resources
 import sys
@@ -7,7 +9,8 @@ from collections import OrderedDict
 from itertools import islice
 from pathlib import Path
 from six import text_type
-from typing import Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
+from uuid import UUID
 
 from datalad.distribution.dataset import (
     Dataset,
@@ -24,6 +27,20 @@ from . import aggregate_layout_version
 
 import logging
 
+# orjson is optional, it is used to speed up JSON serialization
+try:
+    import orjson
+    # Let orjson hand dataclasses and datetime objects to _json_default(),
+    # which rejects them, like the standard library does. Non-string keys
+    # are not enabled, because orjson accepts more key types than the
+    # standard library, dictionaries with non-string keys are therefore
+    # serialized by the standard library.
+    _orjson_options = (
+        orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_DATETIME)
+except ImportError:
+    orjson = None
+
 
 lgr = logging.getLogger('datalad.dataset')
 
@@ -256,6 +273,100 @@ def check_dataset(dataset_or_path: Union[Dataset, str], purpose: str) -> Dataset
     return dataset
 
 
+def _json_default(obj: Any) -> Any:
+    # orjson serializes UUIDs and enums natively, without calling
+    # _json_default(). Serialize them in the same way with the standard
+    # library, so that both backends accept and reject the same objects.
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    raise TypeError(
+        f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _contains_non_finite_float(obj: Any) -> bool:
+    pending = [obj]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+    return False
+
+
+def _orjson_dumps(obj: Any) -> Optional[bytes]:
+    """
+    Serialize obj with orjson, return None, if orjson is not installed or
+    if the standard library has to be used to serialize obj.
+    """
+    if orjson is None:
+        return None
+    try:
+        json_bytes = orjson.dumps(
+            obj,
+            default=_json_default,
+            option=_orjson_options)
+    except TypeError:
+        # orjson cannot serialize obj, e.g. because it contains an
+        # integer that exceeds 64 bit, or a non-string key
+        return None
+    # orjson writes non-finite floats as null, the standard library
+    # writes them as NaN, Infinity, or -Infinity. Only search for them if
+    # there is a null in the output.
+    if b"null" in json_bytes and _contains_non_finite_float(obj):
+        return None
+    return json_bytes
+
+
+def _stdlib_json_dumps(obj: Any) -> str:
+    return json.dumps(obj, default=_json_default)
+
+
+def json_dumps(obj: Any) -> str:
+    """
+    Serialize obj to a JSON string. If orjson is installed it is used to
+    speed up serialization, otherwise, or if orjson cannot serialize obj,
+    the standard library is used. Both accept the same objects and create
+    JSON that is parsed into equal values. The formatting differs: orjson
+    output is compact and not ASCII-escaped, and float exponents are
+    written differently, e.g. 1e16 instead of 1e+16.
+    """
+    json_bytes = _orjson_dumps(obj)
+    if json_bytes is not None:
+        return json_bytes.decode()
+    return _stdlib_json_dumps(obj)
+
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    """
+    Serialize obj to UTF-8 encoded JSON, like json_dumps(). With orjson the
+    bytes are created directly, without an intermediate string.
+    """
+    json_bytes = _orjson_dumps(obj)
+    if json_bytes is not None:
+        return json_bytes
+    return _stdlib_json_dumps(obj).encode()
+
+
+def json_loads(json_string: Union[str, bytes]) -> Any:
+    """
+    Deserialize a JSON string. If orjson is installed it is used,
+    otherwise, or if orjson rejects the input, e.g. because it contains
+    NaN, the standard library is used.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(json_string)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(json_string)
+
+
 def read_json_object(path_or_object: Union[str, JSONObject]) -> JSONObject:
     if isinstance(path_or_object, str):
         if path_or_object == "-":